@@ -1,12 +1,59 @@
-from google.adk.agents.llm_agent import Agent
+import logging
+import os
+from functools import cache
 
 # 支持相对导入和绝对导入两种方式
 try:
     # 作为包的一部分时使用相对导入
-    from .tools import Get_Weather, Calc_RealFeel, Match_Clothing
+    from .tools import Get_Outfit_Advice
 except ImportError:
     # 直接导入时使用绝对导入
-    from tools import Get_Weather, Calc_RealFeel, Match_Clothing
+    from tools import Get_Outfit_Advice
+
+# 日志配置见 tools.py（输出到 stderr，级别由 SMARTCLOTH_LOG_LEVEL 控制）
+logger = logging.getLogger("smartcloth")
+
+
+# 模型配置：任务只需提取城市/日期并套用输出模板，默认使用轻量模型
+# 设置为 "ollama_chat/<模型名>"（如 ollama_chat/qwen2.5:3b-instruct-q4_K_M）可改用本地量化模型
+DEFAULT_MODEL = "gemini-2.5-flash-lite"
+LOCAL_MODEL_PREFIXES = ("ollama/", "ollama_chat/")
+
+
+def _resolve_model(model_name: str):
+    """
+    将模型名称解析为 Agent 可用的模型配置
+    
+    Args:
+        model_name: 模型名称（Gemini 模型名，或带 ollama 前缀的本地模型名）
+    
+    Returns:
+        Gemini 模型名称字符串，或本地模型的 LiteLlm 实例
+    """
+    if model_name.startswith(LOCAL_MODEL_PREFIXES):
+        # 本地模型通过 LiteLLM 接入（需额外安装 litellm）
+        from google.adk.models.lite_llm import LiteLlm
+        return LiteLlm(model=model_name)
+    return model_name
+
+
+# 系统指令：作为静态前缀在每次请求中保持逐字节一致（不含时间戳、不拼接用户输入，
+# 也不含 {变量} 占位符以免触发 ADK 的会话状态注入），以便服务端复用前缀 KV 缓存。
+# 该指令远低于 Gemini 显式上下文缓存（CachedContent）的最小 token 数，依赖其隐式前缀缓存即可。
+CLOTHING_ASSISTANT_INSTRUCTION = '''你是智能穿衣助理。
+规则：
+1. 从用户输入提取城市和日期；日期直接传相对词（今天/明天/后天/大后天）或YYYY-MM-DD，未指定则传"今天"，不要追问。
+2. 只调用一次 Get_Outfit_Advice(city, date)，随后立即按模板输出；[]内为工具返回的字段名，原样填入其值，不要编造。
+输出模板：
+🌡️ **气象看板**：[city] [date] 实际温度 [temp_max]°C/[temp_min]°C，受 [wind]级风 与 [humidity]%湿度 影响，**体感 [real_feel]°C**（官方参考 [official_real_feel_avg]°C）
+👕 **穿搭方案**（洋葱式穿衣法）：
+* **核心层**：[clothing_base]
+* **防护层**：[extra_items]
+* **配饰建议**：[accessories]
+* **鞋履推荐**：[footwear]
+🎒 **行李提醒**：[luggage_tips]
+💡 **决策逻辑**：[logic]
+'''
 
 
 def log_agent_thought(user_query: str):
@@ -16,92 +63,102 @@ def log_agent_thought(user_query: str):
     Args:
         user_query: 用户查询
     """
-    print(f"[思考] 分析用户查询: {user_query}")
-    print(f"[思考] 提取关键信息: 城市名称、出行日期")
+    logger.info(f"[思考] 分析用户查询: {user_query}")
+    logger.info("[思考] 提取关键信息: 城市名称、出行日期")
+
+
+def _event_text(event) -> str:
+    """
+    提取流式事件中的文本内容（忽略工具调用、工具结果等非文本部分）
+    
+    Args:
+        event: stream_query 产生的事件（字典，或带 content.parts 属性的 Event 对象）
+    
+    Returns:
+        事件中所有文本部分拼接后的字符串，无文本时为空字符串
+    """
+    if isinstance(event, dict):
+        parts = (event.get("content") or {}).get("parts") or []
+        return "".join(part.get("text") or "" for part in parts)
+    parts = getattr(getattr(event, "content", None), "parts", None) or []
+    return "".join(getattr(part, "text", None) or "" for part in parts)
 
 
-def query_with_logging(agent, user_query: str):
+def query_with_logging(agent, user_query: str, stream: bool = False):
     """
     带日志的智能体查询包装函数
     
     Args:
         agent: 智能体实例
         user_query: 用户查询
+        stream: 是否流式输出（边生成边打印，用户无需等待完整响应）
     
     Returns:
-        智能体的响应
+        智能体的响应（流式模式下为拼接后的完整响应）
     """
     # 输出思考阶段日志
     log_agent_thought(user_query)
     
     # 调用智能体（工具调用日志会自动输出）
-    response = agent.query(user_query)
+    if stream:
+        chunks = []
+        for event in agent.stream_query(user_query):
+            text = _event_text(event)
+            if text:
+                print(text, end="", flush=True)
+                chunks.append(text)
+        print()
+        response = "".join(chunks)
+    else:
+        response = agent.query(user_query)
     
     return response
 
-# 智能穿衣助理
-clothing_assistant = Agent(
-    model='gemini-2.5-flash',
-    name='clothing_assistant',
-    description='智能穿衣助理，根据用户的出行计划提供科学的穿衣和行李建议',
-    instruction='''
-你是一个专业的"智能穿衣助理"。根据用户的出行计划，调用工具获取天气信息，然后给出科学的穿衣和行李建议。
-
-# 工作流程
 
-1. 从用户输入中提取城市名称和日期，并进行日期计算：
-   - 如果用户说"今天"、"今日"、"today"：使用当前日期
-   - 如果用户说"明天"、"明日"、"tomorrow"：使用当前日期+1天
-   - 如果用户说"后天"、"后日"、"day after tomorrow"：使用当前日期+2天
-   - 如果用户说"大后天"：使用当前日期+3天
-   - 如果用户提供具体日期（如"2025-12-29"）：直接使用该日期
-   - 如果未指定日期：默认使用"今天"
-   - **重要**：不要询问用户具体日期，直接根据当前日期计算相对日期
-
-2. 依次调用工具：
-   - Get_Weather(城市, 日期) → 获取天气数据（包含温度、风速、湿度、降水概率，以及官方体感温度official_real_feel_avg作为参考）
-   - Calc_RealFeel(平均温度, 风速_kmh, 湿度) → 计算体感温度（平均温度 = (最高温 + 最低温) / 2，风速从Get_Weather返回的wind_speed_kmh字段获取，湿度从humidity字段获取）
-   - Match_Clothing(体感温度, 天气数据) → 获取多维度穿衣建议
-   
-   注意：Get_Weather返回的official_real_feel_avg是Open-Meteo API官方提供的体感温度，可以作为Calc_RealFeel计算结果的交叉验证参考
-
-3. 整理结果，使用以下专业格式输出：
-
-🌡️ **气象看板**：[城市] [日期] 实际温度 [最高温]°C/[最低温]°C，但受 [根据风力等级描述，如"4级大风"或"微风"] 与 [根据湿度描述，如"85%高湿度"或"适中湿度"] 影响，**体感仅为 [体感温度]°C**（官方API参考值：[official_real_feel_avg]°C，用于交叉验证）。
-
-👕 **穿搭方案**：建议采用**洋葱式穿衣法**。
-
-* **核心层**：[从Match_Clothing返回的clothing_base或base_clothing字段]
-
-* **防护层**：[从Match_Clothing返回的extra_items字段，如果包含多条建议，用分号分隔]
-
-* **配饰建议**：[从Match_Clothing返回的accessories字段，如果为"无"则写"无需额外配饰"]
-
-* **鞋履推荐**：[从Match_Clothing返回的footwear字段，必须包含此信息]
+def _check_api_key(model_name: str):
+    """
+    检查 Gemini 模型所需的 API Key 是否已配置（模块导入时执行一次）
+    
+    Args:
+        model_name: 模型名称
+    """
+    if model_name.startswith(LOCAL_MODEL_PREFIXES):
+        # 本地模型无需 API Key
+        return
+    if os.environ.get("GOOGLE_GENAI_USE_VERTEXAI", "").lower() in ("1", "true"):
+        # 使用 Vertex AI 时通过 Google Cloud 凭据认证
+        return
+    if not os.environ.get("GOOGLE_API_KEY"):
+        logger.warning("[警告] 未设置环境变量 GOOGLE_API_KEY，调用 Gemini 模型将失败。请参考 README 进行配置。")
 
-🎒 **行李提醒**：
 
-* [根据Match_Clothing返回的extra_items和footwear字段，智能生成行李建议]
-  - 如果降水概率≥50%：必须携带雨伞或雨衣
-  - 如果降水概率20-50%：建议携带折叠伞备用
-  - 如果体感温度<5°C：建议携带围巾、手套等保暖配饰
-  - 如果湿度>80%且温度<15°C：提醒注意防潮，选择合适材质的外套
-  - 如果温度≥30°C：提醒携带防晒用品
+MODEL_NAME = os.environ.get("SMARTCLOTH_MODEL", DEFAULT_MODEL)
+_check_api_key(MODEL_NAME)
 
-* [根据体感温度和特殊环境，给出额外的保暖或防护建议，如"体感已近冰点，建议加带一条围巾保护颈椎"]
 
-💡 **决策逻辑**：[从Match_Clothing返回的logic字段，必须明确说明为什么这样建议，例如"考虑到高湿桑拿环境，已为您优化为速干方案"或"检测到湿冷环境，已强化防风拨水方案"]
+@cache
+def get_clothing_assistant():
+    """
+    获取智能穿衣助理实例（首次调用时才导入 Google ADK 并创建，之后复用同一实例）
+    
+    Returns:
+        智能体实例
+    """
+    from google.adk.agents.llm_agent import Agent
+    
+    return Agent(
+        model=_resolve_model(MODEL_NAME),
+        name='clothing_assistant',
+        description='智能穿衣助理，根据用户的出行计划提供科学的穿衣和行李建议',
+        instruction=CLOTHING_ASSISTANT_INSTRUCTION,
+        tools=[Get_Outfit_Advice],
+    )
 
-# 输出要求
-- 所有工具调用完成后，必须立即输出最终答案
-- 使用工具返回的完整数据，特别是Match_Clothing返回的多维度信息
-- **必须包含鞋履推荐和决策逻辑说明**，这是体现Agent智能决策能力的关键
-- 输出要专业、详细，体现多因子综合决策的能力
-- 决策逻辑部分要清晰说明为什么这样建议，让用户理解Agent的思考过程
-- 保持格式清晰，使用markdown格式增强可读性
-''',
-    tools=[Get_Weather, Calc_RealFeel, Match_Clothing],
-)
 
-# 保持向后兼容
-root_agent = clothing_assistant
+def __getattr__(name: str):
+    """
+    模块属性的延迟创建：保持 clothing_assistant / root_agent（ADK 按此名称加载智能体）的向后兼容
+    """
+    if name in ("clothing_assistant", "root_agent"):
+        return get_clothing_assistant()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
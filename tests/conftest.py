@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 项目根目录即模块目录（agent.py、tools.py），加入导入路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# 天气预报磁盘缓存写到临时目录，避免测试读写用户的 ~/.cache/smartcloth（须在导入 tools 之前设置）
+os.environ.setdefault("SMARTCLOTH_CACHE_DIR", tempfile.mkdtemp(prefix="smartcloth-test-"))
@@ -0,0 +1,73 @@
+"""
+agent 模块的单元测试（未安装 google-adk 时使用替身 Agent 类）
+"""
+import importlib.util
+import sys
+import types
+
+import pytest
+
+import agent
+
+
+class _StubAgent:
+    """只记录构造参数的 Agent 替身"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+@pytest.fixture
+def clothing_assistant(monkeypatch):
+    try:
+        adk_missing = importlib.util.find_spec("google.adk") is None
+    except ModuleNotFoundError:
+        adk_missing = True
+    if adk_missing:
+        stub = types.ModuleType("google.adk.agents.llm_agent")
+        stub.Agent = _StubAgent
+        monkeypatch.setitem(sys.modules, "google.adk.agents.llm_agent", stub)
+    monkeypatch.setattr(agent, "MODEL_NAME", agent.DEFAULT_MODEL)
+
+    agent.get_clothing_assistant.cache_clear()
+    yield agent.get_clothing_assistant()
+    agent.get_clothing_assistant.cache_clear()
+
+
+def test_instruction_is_static_template():
+    # ADK 会把指令中的 {变量} 当作会话状态注入，模板占位符必须使用 [字段]
+    assert "{" not in agent.CLOTHING_ASSISTANT_INSTRUCTION
+    assert "}" not in agent.CLOTHING_ASSISTANT_INSTRUCTION
+
+
+def test_assistant_uses_instruction_verbatim(clothing_assistant):
+    # 指令必须逐字节不变，才能命中模型端的前缀缓存
+    assert clothing_assistant.instruction == agent.CLOTHING_ASSISTANT_INSTRUCTION
+    assert clothing_assistant.name == "clothing_assistant"
+
+
+def test_root_agent_is_cached_assistant(clothing_assistant):
+    assert agent.root_agent is clothing_assistant
+
+
+class _FakeStreamingAgent:
+    """按 ADK 事件格式逐条产生事件的智能体替身"""
+
+    def __init__(self, events):
+        self.events = events
+
+    def stream_query(self, user_query):
+        yield from self.events
+
+
+def test_streaming_prints_and_returns_text_parts(capsys):
+    events = [
+        {"content": {"role": "model", "parts": [{"function_call": {"name": "Get_Outfit_Advice", "args": {}}}]}},
+        {"content": {"role": "model", "parts": [{"text": "北京后天"}]}},
+        {"content": {"role": "model", "parts": [{"text": "最高 12°C"}]}},
+    ]
+
+    response = agent.query_with_logging(_FakeStreamingAgent(events), "北京后天天气", stream=True)
+
+    assert response == "北京后天最高 12°C"
+    assert capsys.readouterr().out == "北京后天最高 12°C\n"
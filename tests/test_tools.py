@@ -0,0 +1,143 @@
+"""
+tools 模块的单元测试（无需网络，HTTP 请求由 httpx.MockTransport 模拟）
+"""
+import json
+import time
+
+import numpy as np
+import pytest
+
+import tools
+
+
+# 覆盖低温区、中间区域、高温区及湿冷修正的各个分支边界
+TEMPS = np.arange(-20, 40.01, 0.5)
+WINDS = np.array([0, 0.5, 4, 10, 18.3, 36, 60])
+HUMIDITIES = np.array([0, 30, 50, 70, 70.5, 85, 100])
+
+
+@pytest.fixture(scope="module")
+def grid():
+    temps, winds, hums = np.meshgrid(TEMPS, WINDS, HUMIDITIES, indexing="ij")
+    return temps.ravel(), winds.ravel(), hums.ravel()
+
+
+def test_scalar_real_feel_matches_array_kernel(grid):
+    temps, winds, hums = grid
+    expected = tools._real_feel_array(temps, winds, hums)
+    actual = np.array([
+        tools._real_feel(float(t), float(w), float(h)) for t, w, h in zip(temps, winds, hums)
+    ])
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_calc_real_feel_agrees_with_batch(grid):
+    temps, winds, hums = grid
+    batch = tools.Calc_RealFeel_Batch(temps, winds, hums)
+    for t, w, h, b in zip(temps[::37], winds[::37], hums[::37], batch[::37]):
+        # 两者取整方式不同（round 与 np.round），仅在 0.05 边界上可能相差 0.1
+        assert tools.Calc_RealFeel(float(t), float(w), float(h)) == pytest.approx(b, abs=0.1 + 1e-9)
+
+
+# ---------- 天气预报磁盘缓存 ----------
+
+FORECAST_DATE = "2030-01-01"
+DAILY = {
+    "time": [FORECAST_DATE],
+    "temperature_2m_max": [8.4],
+    "temperature_2m_min": [1.6],
+    "apparent_temperature_max": [5.0],
+    "apparent_temperature_min": [-2.0],
+    "precipitation_probability_max": [30],
+    "windspeed_10m_max": [8.0],
+    "relative_humidity_2m_max": [88],
+}
+
+
+class _FakeOpenMeteo:
+    """模拟 Open-Meteo 接口，记录收到的请求；forecast_response 可替换为错误响应"""
+
+    def __init__(self):
+        self.requests = []
+        self.forecast_response = None
+
+    def __call__(self, request):
+        import httpx
+
+        self.requests.append(request)
+        if "geocoding" in request.url.host:
+            return httpx.Response(200, json={"results": [{"latitude": 39.9, "longitude": 116.4, "name": "北京"}]})
+        if self.forecast_response is not None:
+            return self.forecast_response
+        return httpx.Response(200, json={"current": {"relative_humidity_2m": 60}, "daily": DAILY})
+
+
+@pytest.fixture
+def open_meteo(monkeypatch, tmp_path):
+    httpx = pytest.importorskip("httpx")
+    server = _FakeOpenMeteo()
+    monkeypatch.setattr(tools, "_client", httpx.Client(transport=httpx.MockTransport(server)))
+    monkeypatch.setattr(tools, "FORECAST_CACHE_FILE", tmp_path / "forecast_cache.json")
+    monkeypatch.setattr(tools, "_forecast_cache", None)
+    monkeypatch.setattr(tools, "_geocode_cache", {"北京": (39.9, 116.4, "北京")})
+    return server
+
+
+def _expire_cached_forecasts():
+    # 超过有效期但仍在兜底期限内
+    for entry in tools._forecast_cache.values():
+        entry["fetched_at"] = time.time() - tools.FORECAST_TTL_FAR - 1
+
+
+def _error_responses():
+    import httpx
+
+    return [
+        httpx.Response(503, text="service unavailable"),
+        httpx.Response(200, text="<html>bad gateway</html>"),
+    ]
+
+
+def test_fresh_forecast_is_served_from_disk_without_request(open_meteo):
+    first = tools.Get_Weather("北京", FORECAST_DATE)
+    assert len(open_meteo.requests) == 1
+    assert tools.FORECAST_CACHE_FILE.exists()
+
+    tools._forecast_cache = None  # 模拟进程重启，只能从磁盘读取
+    assert tools.Get_Weather("北京", FORECAST_DATE) == first
+    assert len(open_meteo.requests) == 1
+
+
+@pytest.mark.parametrize("response_index", [0, 1], ids=["http-error", "non-json"])
+def test_expired_forecast_falls_back_to_stale_data(open_meteo, response_index):
+    fresh = tools.Get_Weather("北京", FORECAST_DATE)
+    _expire_cached_forecasts()
+    open_meteo.forecast_response = _error_responses()[response_index]
+
+    assert tools.Get_Weather("北京", FORECAST_DATE) == fresh
+    assert len(open_meteo.requests) == 2
+
+
+@pytest.mark.parametrize("response_index", [0, 1], ids=["http-error", "non-json"])
+def test_error_without_cached_forecast_raises_connection_error(open_meteo, response_index):
+    open_meteo.forecast_response = _error_responses()[response_index]
+
+    with pytest.raises(ConnectionError):
+        tools.Get_Weather("北京", FORECAST_DATE)
+
+
+@pytest.mark.parametrize("content", [
+    "[1, 2, 3]",
+    json.dumps({"39.9:116.4:" + FORECAST_DATE: {"data": {"daily": DAILY}}}),
+    json.dumps({"39.9:116.4:" + FORECAST_DATE: {"fetched_at": "yesterday", "data": {}}}),
+    "{not json",
+], ids=["not-a-dict", "missing-fetched-at", "bad-fetched-at", "corrupt"])
+def test_malformed_cache_file_is_dropped(open_meteo, content):
+    tools.FORECAST_CACHE_FILE.write_text(content, encoding="utf-8")
+
+    weather = tools.Get_Weather("北京", FORECAST_DATE)
+
+    assert weather["temp_max"] == 8
+    assert len(open_meteo.requests) == 1
+    cached = json.loads(tools.FORECAST_CACHE_FILE.read_text(encoding="utf-8"))
+    assert list(cached) == ["39.9:116.4:" + FORECAST_DATE]
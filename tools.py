@@ -1,10 +1,61 @@
 """
 智能穿衣助理的工具函数
 """
+import inspect
+import json
+import logging
 import math
-import requests
-from datetime import datetime, timedelta
+import os
+import sys
+import threading
+import time
+import weakref
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date as date_cls, timedelta
 from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# NumPy 只在批量体感计算时导入，asyncio 只在异步查询时导入：离线使用 Calc_RealFeel 等单值工具无需加载
+if TYPE_CHECKING:
+    import httpx
+    import numpy as np
+
+# 日志：输出到 stderr，stdout 只留给智能体的响应内容；日志级别由 SMARTCLOTH_LOG_LEVEL 控制（默认 INFO）
+def _parse_log_level(value: str):
+    """
+    解析日志级别，支持级别名（如 DEBUG、warning）和数值（如 10）
+    
+    Args:
+        value: 环境变量中的原始字符串
+    
+    Returns:
+        int | None: 日志级别数值，无法识别时返回 None
+    """
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else None
+
+
+logger = logging.getLogger("smartcloth")
+# 导入时宿主程序已配置 logging（如 ADK）则交给根 logger 处理；否则挂载自己的 stderr handler，
+# 同时关闭传播，避免宿主之后再配置根 logger 时每条日志重复输出
+if not logger.handlers and not logging.getLogger().handlers:
+    _log_handler = logging.StreamHandler(sys.stderr)
+    _log_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_log_handler)
+    logger.propagate = False
+_log_level_env = os.environ.get("SMARTCLOTH_LOG_LEVEL") or "INFO"
+_log_level = _parse_log_level(_log_level_env)
+if _log_level is None:
+    logger.setLevel(logging.INFO)
+    logger.warning(f"[警告] SMARTCLOTH_LOG_LEVEL={_log_level_env!r} 无法识别，已使用 INFO")
+else:
+    logger.setLevel(_log_level)
 
 # 常量定义
 RELATIVE_DATE_MAP = {
@@ -13,6 +64,7 @@ RELATIVE_DATE_MAP = {
     "后天": 2, "day after tomorrow": 2, "后日": 2,
     "大后天": 3
 }
+_OFFSET_CACHE = {k: timedelta(days=v) for k, v in RELATIVE_DATE_MAP.items()}
 
 # 温度阈值
 TEMP_VERY_COLD = 0
@@ -41,28 +93,144 @@ RAIN_CHANCE_EXTREME = 70
 # API 超时时间
 API_TIMEOUT = 10
 
+# Open-Meteo 接口地址
+GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+
+# 批量查询的最大并发数
+BATCH_MAX_WORKERS = 16
+
+# 模块级 HTTP/2 客户端：复用 TCP/TLS 连接，避免每次请求重新握手
+# httpx 在首次发起请求时才导入，纯离线计算（如 Calc_RealFeel）无需加载网络库
+HTTP_MAX_KEEPALIVE = 8
+_client = None
+_client_lock = threading.Lock()
+# 异步客户端的连接池绑定在创建它的事件循环上，因此按事件循环各保留一个；
+# 事件循环结束后对应条目随之释放（如多次 asyncio.run）
+_async_clients = weakref.WeakKeyDictionary()  # 事件循环 → httpx.AsyncClient
+
+# 城市经纬度缓存（城市坐标基本不变，同步与异步查询共用）
+GEOCODE_CACHE_SIZE = 512
+_geocode_cache = {}  # 城市名 → (纬度, 经度, 标准城市名)
+_geocode_cache_lock = threading.Lock()
+
+# 天气预报磁盘缓存（同一经纬度、同一日期的预报在 TTL 内直接复用）
+FORECAST_CACHE_FILE = Path(
+    os.environ.get("SMARTCLOTH_CACHE_DIR", Path.home() / ".cache" / "smartcloth")
+) / "forecast_cache.json"
+FORECAST_TTL_NEAR = 3600  # 今天/明天的预报：1 小时
+FORECAST_TTL_FAR = 21600  # 后天及以后的预报：6 小时
+FORECAST_STALE_MAX = 86400  # 过期数据最多保留 1 天，用于 API 失败时兜底
+
+_forecast_cache = None  # 首次使用时从磁盘加载
+_forecast_cache_lock = threading.Lock()
+
+
+def _http_client():
+    """
+    获取模块级 HTTP/2 客户端（首次调用时导入 httpx 并创建）
+    
+    Returns:
+        httpx.Client 实例
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                _client = httpx.Client(
+                    http2=True, timeout=API_TIMEOUT,
+                    limits=httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+                )
+    return _client
+
+
+def _async_http_client():
+    """
+    获取当前事件循环的模块级异步 HTTP/2 客户端（首次调用时创建，需在协程中调用）
+    
+    Returns:
+        httpx.AsyncClient 实例
+    """
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+        client = _async_clients[loop] = httpx.AsyncClient(
+            http2=True, timeout=API_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+        )
+    return client
+
 
-def _parse_relative_date(date: str) -> str:
+def _api_errors() -> tuple:
+    """
+    天气 API 请求可能抛出的异常类型（httpx 延迟导入）
+    
+    响应体不是合法 JSON（如网关返回的 HTML 错误页）与网络错误同等处理：
+    预报请求可回退到过期缓存，对外统一转换为 ConnectionError。
+    
+    Returns:
+        可直接用于 except 子句的异常类型元组
+    """
+    import httpx
+    return (httpx.HTTPError, orjson.JSONDecodeError)
+
+
+def _decode_response(response) -> dict:
+    """
+    检查 HTTP 状态码并解析 JSON 响应体
+    
+    Args:
+        response: httpx 响应对象（同步、异步客户端通用）
+    
+    Returns:
+        解析后的字典
+    """
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@contextmanager
+def _translate_weather_errors():
+    """
+    将天气查询过程中的异常统一转换为工具对外抛出的异常类型（同步、异步函数通用）
+    """
+    try:
+        yield
+    except _api_errors() as e:
+        # API 调用失败时的错误处理
+        raise ConnectionError(f"无法获取天气数据：{str(e)}。请检查网络连接。")
+    except (KeyError, IndexError) as e:
+        # API 返回数据格式异常
+        raise ValueError(f"天气 API 返回数据格式异常：{str(e)}")
+
+
+def _parse_relative_date(date: str, _today: date_cls = None) -> str:
     """
     解析相对日期并转换为具体日期
     
     Args:
         date: 相对日期字符串（如"今天"、"明天"）或具体日期（YYYY-MM-DD）
+        _today: 作为基准的当天日期，默认取系统当前日期（批量解析时可传入以复用）
     
     Returns:
         具体日期字符串（YYYY-MM-DD）
     """
-    date_lower = date.lower()
-    today = datetime.now()
+    # 快速路径：具体日期（YYYY-MM-DD）直接返回，无需读取系统时间
+    if len(date) == 10 and date[4] == "-" and date[7] == "-":
+        return date
     
-    if date_lower in RELATIVE_DATE_MAP:
-        days_offset = RELATIVE_DATE_MAP[date_lower]
-        target_date = (today + timedelta(days=days_offset)).strftime("%Y-%m-%d")
-    else:
+    offset = _OFFSET_CACHE.get(date.lower())
+    if offset is None:
         # 假设是具体日期格式（YYYY-MM-DD）
-        target_date = date
+        return date
     
-    return target_date
+    if _today is None:
+        _today = date_cls.today()
+    return (_today + offset).isoformat()
 
 
 def _extract_official_real_feel(daily: dict, index: int) -> tuple:
@@ -95,52 +263,484 @@ def _extract_official_real_feel(daily: dict, index: int) -> tuple:
     return official_real_feel_max, official_real_feel_min, official_real_feel_avg
 
 
+# 工具日志中展示的关键字段
+_SUMMARY_FIELDS = frozenset({
+    'city', 'date', 'temp_max', 'temp_min', 'wind', 'humidity', 'precipitation',
+    'clothing', 'special_items'
+})
+
+
 def tool_logger(tool_name: str, description: str):
     """
-    工具函数日志装饰器
+    工具函数日志装饰器（同时支持普通函数和异步函数）
     
     Args:
         tool_name: 工具名称
         description: 工具描述
     """
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        def log_call(args, kwargs):
+            if not logger.isEnabledFor(logging.INFO):
+                return
+            
             # 格式化参数用于日志显示
             args_str = ", ".join([str(arg) for arg in args])
             kwargs_str = ", ".join([f"{k}={v}" for k, v in kwargs.items()])
             params_str = ", ".join(filter(None, [args_str, kwargs_str]))
             
             # 调用前日志
-            print(f"[行动] 调用工具 {tool_name}({params_str})")
+            logger.info(f"[行动] 调用工具 {tool_name}({params_str})")
+        
+        def log_result(result):
+            if not logger.isEnabledFor(logging.INFO):
+                return
             
+            # 格式化结果用于日志显示（只显示关键信息，避免过长）
+            if isinstance(result, dict):
+                # 对于字典，显示关键字段（按结果中的顺序）
+                result_summary = {k: v for k, v in result.items() if k in _SUMMARY_FIELDS}
+                result_str = str(result_summary)
+            else:
+                result_str = str(result)
+            
+            # 调用后日志
+            logger.info(f"[结果] {tool_name} 执行成功: {result_str}")
+        
+        def log_error(e):
+            # 错误日志
+            logger.error(f"[结果] {tool_name} 执行失败: {str(e)}")
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                log_call(args, kwargs)
+                try:
+                    # 执行工具函数
+                    result = await func(*args, **kwargs)
+                    log_result(result)
+                    return result
+                except Exception as e:
+                    log_error(e)
+                    raise
+            
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            log_call(args, kwargs)
             try:
                 # 执行工具函数
                 result = func(*args, **kwargs)
-                
-                # 格式化结果用于日志显示（只显示关键信息，避免过长）
-                if isinstance(result, dict):
-                    # 对于字典，显示关键字段
-                    key_fields = ['city', 'date', 'temp_max', 'temp_min', 'wind', 'humidity', 'precipitation', 
-                                 'clothing', 'special_items']
-                    result_summary = {k: v for k, v in result.items() if k in key_fields}
-                    result_str = str(result_summary)
-                else:
-                    result_str = str(result)
-                
-                # 调用后日志
-                print(f"[结果] {tool_name} 执行成功: {result_str}")
-                
+                log_result(result)
                 return result
             except Exception as e:
-                # 错误日志
-                print(f"[结果] {tool_name} 执行失败: {str(e)}")
+                log_error(e)
                 raise
         
         return wrapper
     return decorator
 
 
+def _geocoding_params(city: str) -> dict:
+    """
+    构造地理编码请求参数
+    
+    Args:
+        city: 城市名称（支持中英文）
+    
+    Returns:
+        请求参数字典
+    """
+    return {
+        "name": city,
+        "count": 1,  # 只取第一个结果
+        "language": "zh"  # 中文
+    }
+
+
+def _remember_location(city: str, geo_data: dict) -> tuple:
+    """
+    从地理编码结果中提取经纬度并写入缓存
+    
+    Args:
+        city: 城市名称
+        geo_data: 地理编码 API 返回的数据字典
+    
+    Returns:
+        (纬度, 经度, 标准城市名)
+    """
+    # 检查是否找到城市
+    if not geo_data.get("results") or len(geo_data["results"]) == 0:
+        raise ValueError(f"未找到城市：{city}，请检查城市名称是否正确。")
+    
+    # 获取第一个结果的经纬度
+    location = geo_data["results"][0]
+    coords = (location["latitude"], location["longitude"], location.get("name", city))  # 使用 API 返回的标准城市名
+    
+    with _geocode_cache_lock:
+        if len(_geocode_cache) >= GEOCODE_CACHE_SIZE:
+            # 淘汰最早写入的条目
+            del _geocode_cache[next(iter(_geocode_cache))]
+        _geocode_cache[city] = coords
+    
+    return coords
+
+
+def _geocode(city: str) -> tuple:
+    """
+    通过城市名获取经纬度（优先使用进程内缓存）
+    
+    Args:
+        city: 城市名称（支持中英文）
+    
+    Returns:
+        (纬度, 经度, 标准城市名)
+    """
+    coords = _geocode_cache.get(city)
+    if coords is not None:
+        return coords
+    
+    geo_response = _http_client().get(GEOCODING_URL, params=_geocoding_params(city))
+    return _remember_location(city, _decode_response(geo_response))
+
+
+async def _geocode_async(client: "httpx.AsyncClient", city: str) -> tuple:
+    """
+    _geocode 的异步版本
+    
+    Args:
+        client: 异步 HTTP 客户端
+        city: 城市名称（支持中英文）
+    
+    Returns:
+        (纬度, 经度, 标准城市名)
+    """
+    coords = _geocode_cache.get(city)
+    if coords is not None:
+        return coords
+    
+    geo_response = await client.get(GEOCODING_URL, params=_geocoding_params(city))
+    return _remember_location(city, _decode_response(geo_response))
+
+
+def _forecast_params(latitude: float, longitude: float, target_date: str) -> dict:
+    """
+    构造天气预报请求参数
+    
+    Args:
+        latitude: 纬度
+        longitude: 经度
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        请求参数字典
+    """
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": "relative_humidity_2m",  # 当前湿度（每日湿度缺失时的兜底）
+        "daily": "temperature_2m_max,temperature_2m_min,apparent_temperature_max,apparent_temperature_min,precipitation_probability_max,windspeed_10m_max,relative_humidity_2m_max",  # 获取每日数据，包括湿度和官方体感温度
+        "timezone": "auto",  # 自动时区
+        "start_date": target_date,
+        "end_date": target_date
+    }
+
+
+def _forecast_ttl(target_date: str) -> int:
+    """
+    根据预报日期距今天数确定缓存有效期
+    
+    Args:
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        缓存有效期（秒）
+    """
+    try:
+        days_ahead = (date_cls.fromisoformat(target_date) - date_cls.today()).days
+    except ValueError:
+        return FORECAST_TTL_NEAR
+    return FORECAST_TTL_NEAR if days_ahead <= 1 else FORECAST_TTL_FAR
+
+
+def _is_valid_cache_entry(entry) -> bool:
+    """
+    校验磁盘缓存条目的结构
+    
+    Args:
+        entry: 从缓存文件读取的条目
+    
+    Returns:
+        是否为 {"fetched_at": 时间戳, "data": 天气数据字典} 形式
+    """
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("fetched_at"), (int, float))
+        and isinstance(entry.get("data"), dict)
+    )
+
+
+def _load_forecast_cache() -> dict:
+    """
+    加载磁盘缓存（调用方需持有 _forecast_cache_lock）
+    
+    Returns:
+        缓存字典 {缓存键: {"fetched_at": 时间戳, "data": 天气数据}}
+    """
+    global _forecast_cache
+    if _forecast_cache is None:
+        try:
+            raw_cache = json.loads(FORECAST_CACHE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # 缓存文件不存在或已损坏，从空缓存开始
+            raw_cache = {}
+        if not isinstance(raw_cache, dict):
+            raw_cache = {}
+        # 丢弃结构不完整的条目（如手工编辑或旧版本写入的文件），避免后续读取时出错
+        _forecast_cache = {k: v for k, v in raw_cache.items() if _is_valid_cache_entry(v)}
+    return _forecast_cache
+
+
+def _save_forecast_cache(cache: dict):
+    """
+    原子写入磁盘缓存，并清理超过兜底期限的条目（调用方需持有 _forecast_cache_lock）
+    
+    Args:
+        cache: 缓存字典
+    """
+    now = time.time()
+    for key in [k for k, v in cache.items() if now - v["fetched_at"] > FORECAST_STALE_MAX]:
+        del cache[key]
+    
+    try:
+        FORECAST_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = FORECAST_CACHE_FILE.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_file, FORECAST_CACHE_FILE)
+    except OSError:
+        # 缓存仅用于加速，写入失败不影响正常查询
+        pass
+
+
+def _forecast_cache_key(latitude: float, longitude: float, target_date: str) -> str:
+    """
+    生成天气预报缓存键
+    
+    Args:
+        latitude: 纬度
+        longitude: 经度
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        缓存键
+    """
+    return f"{round(latitude, 2)}:{round(longitude, 2)}:{target_date}"
+
+
+def _get_cached_forecast(cache_key: str) -> dict:
+    """
+    读取天气预报缓存条目
+    
+    Args:
+        cache_key: 缓存键
+    
+    Returns:
+        缓存条目 {"fetched_at": 时间戳, "data": 天气数据}，不存在时返回 None
+    """
+    with _forecast_cache_lock:
+        return _load_forecast_cache().get(cache_key)
+
+
+def _store_cached_forecast(cache_key: str, weather_data: dict):
+    """
+    写入天气预报缓存条目并持久化到磁盘
+    
+    Args:
+        cache_key: 缓存键
+        weather_data: Open-Meteo 返回的天气数据字典
+    """
+    with _forecast_cache_lock:
+        cache = _load_forecast_cache()
+        cache[cache_key] = {"fetched_at": time.time(), "data": weather_data}
+        _save_forecast_cache(cache)
+
+
+def _is_fresh(entry: dict, target_date: str) -> bool:
+    """
+    判断缓存条目是否仍在有效期内
+    
+    Args:
+        entry: 缓存条目（可为 None）
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        是否可直接使用
+    """
+    return entry is not None and time.time() - entry["fetched_at"] < _forecast_ttl(target_date)
+
+
+def _lookup_forecast(latitude: float, longitude: float, target_date: str) -> tuple:
+    """
+    查找天气预报缓存
+    
+    Args:
+        latitude: 纬度
+        longitude: 经度
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        (缓存键, 缓存条目)，无缓存时条目为 None
+    """
+    cache_key = _forecast_cache_key(latitude, longitude, target_date)
+    return cache_key, _get_cached_forecast(cache_key)
+
+
+def _stale_forecast(entry: dict) -> dict:
+    """
+    API 请求失败时的兜底（需在 except 块中调用）
+    
+    有缓存条目时返回过期数据（stale-while-revalidate），否则重新抛出当前异常。
+    
+    Args:
+        entry: 缓存条目（可为 None）
+    
+    Returns:
+        过期的天气数据字典
+    """
+    if entry is None:
+        raise
+    return entry["data"]
+
+
+def _fetch_forecast(latitude: float, longitude: float, target_date: str) -> dict:
+    """
+    获取指定日期的天气预报原始数据（优先使用磁盘缓存）
+    
+    缓存未过期时直接返回；已过期则重新请求，若 API 调用失败则返回过期数据。
+    
+    Args:
+        latitude: 纬度
+        longitude: 经度
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        Open-Meteo 返回的天气数据字典
+    """
+    cache_key, entry = _lookup_forecast(latitude, longitude, target_date)
+    if _is_fresh(entry, target_date):
+        return entry["data"]
+    
+    try:
+        weather_data = _decode_response(
+            _http_client().get(WEATHER_URL, params=_forecast_params(latitude, longitude, target_date))
+        )
+    except _api_errors():
+        return _stale_forecast(entry)
+    
+    _store_cached_forecast(cache_key, weather_data)
+    return weather_data
+
+
+async def _fetch_forecast_async(client: "httpx.AsyncClient", latitude: float, longitude: float, target_date: str) -> dict:
+    """
+    _fetch_forecast 的异步版本（共用同一份磁盘缓存）
+    
+    Args:
+        client: 异步 HTTP 客户端
+        latitude: 纬度
+        longitude: 经度
+        target_date: 具体日期（YYYY-MM-DD）
+    
+    Returns:
+        Open-Meteo 返回的天气数据字典
+    """
+    import asyncio
+    
+    # 缓存读写涉及磁盘 I/O 和线程锁，放到线程池执行，避免阻塞事件循环
+    cache_key, entry = await asyncio.to_thread(_lookup_forecast, latitude, longitude, target_date)
+    if _is_fresh(entry, target_date):
+        return entry["data"]
+    
+    try:
+        weather_data = _decode_response(
+            await client.get(WEATHER_URL, params=_forecast_params(latitude, longitude, target_date))
+        )
+    except _api_errors():
+        return _stale_forecast(entry)
+    
+    await asyncio.to_thread(_store_cached_forecast, cache_key, weather_data)
+    return weather_data
+
+
+def _build_weather_result(city_name: str, target_date: str, weather_data: dict) -> dict:
+    """
+    从 Open-Meteo 原始数据中提取天气信息
+    
+    Args:
+        city_name: 标准城市名
+        target_date: 具体日期（YYYY-MM-DD）
+        weather_data: Open-Meteo 返回的天气数据字典
+    
+    Returns:
+        包含最高温、最低温、风力、降水概率、湿度的字典
+    """
+    daily = weather_data.get("daily", {})
+    current = weather_data.get("current", {})
+    dates = daily.get("time", [])
+    
+    # 查找目标日期的数据（如果找不到，使用第一个可用日期）
+    if target_date in dates:
+        index = dates.index(target_date)
+    elif len(dates) > 0:
+        index = 0  # 使用第一个可用日期
+        target_date = dates[0]  # 更新实际使用的日期
+    else:
+        raise ValueError("未找到指定日期的天气数据。")
+    
+    temp_max = daily.get("temperature_2m_max", [0])[index]
+    temp_min = daily.get("temperature_2m_min", [0])[index]
+    precipitation = daily.get("precipitation_probability_max", [0])[index]
+    wind_speed = daily.get("windspeed_10m_max", [0])[index]
+    
+    # 获取官方体感温度（Open-Meteo API 提供的）
+    official_real_feel_max, official_real_feel_min, official_real_feel_avg = _extract_official_real_feel(daily, index)
+    
+    # 获取湿度：优先使用 daily 的湿度数据，如果没有则使用 current 的湿度
+    humidity_daily = daily.get("relative_humidity_2m_max", [])
+    if humidity_daily and len(humidity_daily) > index:
+        humidity = humidity_daily[index]
+    else:
+        humidity = current.get("relative_humidity_2m", 50)  # 默认50%
+    
+    # 将风速（m/s）转换为风力等级（简化转换：1 m/s ≈ 0.5级）
+    wind_level = round(wind_speed * 0.5)
+    # 将风速（m/s）转换为 km/h（1 m/s = 3.6 km/h）
+    wind_speed_kmh = wind_speed * 3.6
+    
+    # 统一取整一次，平均温度基于取整后的数值计算，保证各字段之间数值一致
+    temp_max = round(temp_max)
+    temp_min = round(temp_min)
+    temp_avg = (temp_max + temp_min) / 2
+    humidity = round(humidity)
+    
+    return {
+        "city": city_name,
+        "date": target_date,
+        "temp_max": temp_max,
+        "temp_min": temp_min,
+        "temp_avg": temp_avg,  # 平均温度，用于体感温度计算
+        "wind": max(0, min(WIND_MAX_LEVEL, wind_level)),  # 限制在 0-12 级（保留用于显示）
+        "wind_speed_kmh": round(wind_speed_kmh, 1),  # 风速（km/h），用于体感温度计算
+        "precipitation": round(precipitation),
+        "humidity": humidity,  # 添加湿度信息
+        # 官方体感温度（用于交叉验证）
+        "official_real_feel_max": official_real_feel_max,  # 官方体感最高温
+        "official_real_feel_min": official_real_feel_min,  # 官方体感最低温
+        "official_real_feel_avg": official_real_feel_avg,  # 官方体感平均温度
+        "description": f"最高温 {temp_max}°C，最低温 {temp_min}°C，湿度 {humidity}%"
+    }
+
+
 @tool_logger("Get_Weather", "获取指定城市和日期的天气信息")
 def Get_Weather(city: str, date: str) -> dict:
     """
@@ -156,151 +756,195 @@ def Get_Weather(city: str, date: str) -> dict:
     # 处理相对日期：自动计算"今天"、"明天"、"后天"等
     target_date = _parse_relative_date(date)
     
-    try:
-        # 第一步：通过城市名获取经纬度
-        geocoding_url = "https://geocoding-api.open-meteo.com/v1/search"
-        geocoding_params = {
-            "name": city,
-            "count": 1,  # 只取第一个结果
-            "language": "zh"  # 中文
-        }
-        
-        geo_response = requests.get(geocoding_url, params=geocoding_params, timeout=API_TIMEOUT)
-        geo_response.raise_for_status()
-        geo_data = geo_response.json()
-        
-        # 检查是否找到城市
-        if not geo_data.get("results") or len(geo_data["results"]) == 0:
-            raise ValueError(f"未找到城市：{city}，请检查城市名称是否正确。")
-        
-        # 获取第一个结果的经纬度
-        location = geo_data["results"][0]
-        latitude = location["latitude"]
-        longitude = location["longitude"]
-        city_name = location.get("name", city)  # 使用 API 返回的标准城市名
+    with _translate_weather_errors():
+        # 第一步：通过城市名获取经纬度（重复城市直接命中缓存）
+        latitude, longitude, city_name = _geocode(city)
         
         # 第二步：使用经纬度获取天气数据
-        weather_url = "https://api.open-meteo.com/v1/forecast"
-        weather_params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "current": "temperature_2m,relative_humidity_2m,wind_speed_10m",  # 获取当前湿度和风速
-            "daily": "temperature_2m_max,temperature_2m_min,apparent_temperature_max,apparent_temperature_min,precipitation_probability_max,windspeed_10m_max,relative_humidity_2m_max",  # 获取每日数据，包括湿度和官方体感温度
-            "timezone": "auto",  # 自动时区
-            "start_date": target_date,
-            "end_date": target_date
-        }
-        
-        weather_response = requests.get(weather_url, params=weather_params, timeout=API_TIMEOUT)
-        weather_response.raise_for_status()
-        weather_data = weather_response.json()
-        
-        # 提取天气信息
-        daily = weather_data.get("daily", {})
-        current = weather_data.get("current", {})
-        dates = daily.get("time", [])
-        
-        # 查找目标日期的数据（如果找不到，使用第一个可用日期）
-        if target_date in dates:
-            index = dates.index(target_date)
-        elif len(dates) > 0:
-            index = 0  # 使用第一个可用日期
-            target_date = dates[0]  # 更新实际使用的日期
-        else:
-            raise ValueError("未找到指定日期的天气数据。")
-        
-        temp_max = daily.get("temperature_2m_max", [0])[index]
-        temp_min = daily.get("temperature_2m_min", [0])[index]
-        precipitation = daily.get("precipitation_probability_max", [0])[index]
-        wind_speed = daily.get("windspeed_10m_max", [0])[index]
+        weather_data = _fetch_forecast(latitude, longitude, target_date)
         
-        # 获取官方体感温度（Open-Meteo API 提供的）
-        official_real_feel_max, official_real_feel_min, official_real_feel_avg = _extract_official_real_feel(daily, index)
-        
-        # 获取湿度：优先使用 daily 的湿度数据，如果没有则使用 current 的湿度
-        humidity_daily = daily.get("relative_humidity_2m_max", [])
-        if humidity_daily and len(humidity_daily) > index:
-            humidity = humidity_daily[index]
-        else:
-            humidity = current.get("relative_humidity_2m", 50)  # 默认50%
-        
-        # 将风速（m/s）转换为风力等级（简化转换：1 m/s ≈ 0.5级）
-        wind_level = round(wind_speed * 0.5)
-        # 将风速（m/s）转换为 km/h（1 m/s = 3.6 km/h）
-        wind_speed_kmh = wind_speed * 3.6
+        return _build_weather_result(city_name, target_date, weather_data)
+
+
+@tool_logger("Get_Weather_Batch", "并发获取多个城市和日期的天气信息")
+def Get_Weather_Batch(queries: list[tuple[str, str]]) -> list:
+    """
+    并发获取多个城市和日期的天气信息（先并发地理编码，再并发请求天气数据）
+    
+    Args:
+        queries: (城市名称, 日期) 列表，日期格式同 Get_Weather
+    
+    Returns:
+        与 queries 顺序一致的天气信息字典列表
+    """
+    if not queries:
+        return []
+    
+    today = date_cls.today()
+    targets = [(city, _parse_relative_date(date, today)) for city, date in queries]
+    cities = list(dict.fromkeys(city for city, _ in targets))  # 去重并保持顺序
+    
+    with _translate_weather_errors():
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_WORKERS, len(targets))) as executor:
+            # 第一步：并发获取所有城市的经纬度（已缓存的城市不会产生网络请求）
+            locations = dict(zip(cities, executor.map(_geocode, cities)))
+            
+            # 第二步：并发获取所有天气数据
+            forecasts = list(executor.map(
+                lambda target: _fetch_forecast(*locations[target[0]][:2], target[1]),
+                targets
+            ))
         
-        result = {
-            "city": city_name,
-            "date": target_date,
-            "temp_max": round(temp_max),
-            "temp_min": round(temp_min),
-            "wind": max(0, min(WIND_MAX_LEVEL, wind_level)),  # 限制在 0-12 级（保留用于显示）
-            "wind_speed_kmh": round(wind_speed_kmh, 1),  # 风速（km/h），用于体感温度计算
-            "precipitation": round(precipitation),
-            "humidity": round(humidity),  # 添加湿度信息
-            # 官方体感温度（用于交叉验证）
-            "official_real_feel_max": official_real_feel_max,  # 官方体感最高温
-            "official_real_feel_min": official_real_feel_min,  # 官方体感最低温
-            "official_real_feel_avg": official_real_feel_avg,  # 官方体感平均温度
-            "description": f"最高温 {round(temp_max)}°C，最低温 {round(temp_min)}°C，湿度 {round(humidity)}%"
-        }
+        return [
+            _build_weather_result(locations[city][2], target_date, weather_data)
+            for (city, target_date), weather_data in zip(targets, forecasts)
+        ]
+
+
+@tool_logger("Get_Weather_Async", "异步获取指定城市和日期的天气信息")
+async def Get_Weather_Async(city: str, date: str) -> dict:
+    """
+    Get_Weather 的异步版本（复用当前事件循环的模块级 httpx.AsyncClient，可在事件循环中并发调用）
+    
+    Args:
+        city: 城市名称（支持中英文，如：北京、Shanghai）
+        date: 日期（格式：YYYY-MM-DD，或相对日期如"今天"、"明天"、"后天"等）
+    
+    Returns:
+        包含最高温、最低温、风力、降水概率、湿度的字典
+    """
+    # 处理相对日期：自动计算"今天"、"明天"、"后天"等
+    target_date = _parse_relative_date(date)
+    client = _async_http_client()
+    
+    with _translate_weather_errors():
+        # 第一步：通过城市名获取经纬度（重复城市直接命中缓存）
+        latitude, longitude, city_name = await _geocode_async(client, city)
         
-        return result
+        # 第二步：使用经纬度获取天气数据
+        weather_data = await _fetch_forecast_async(client, latitude, longitude, target_date)
         
-    except requests.exceptions.RequestException as e:
-        # API 调用失败时的错误处理
-        raise ConnectionError(f"无法获取天气数据：{str(e)}。请检查网络连接。")
-    except (KeyError, IndexError) as e:
-        # API 返回数据格式异常
-        raise ValueError(f"天气 API 返回数据格式异常：{str(e)}")
+        return _build_weather_result(city_name, target_date, weather_data)
 
 
-@tool_logger("Calc_RealFeel", "科学计算体感温度（考虑风寒效应和湿度影响）")
-def Calc_RealFeel(temperature: float, wind_speed_kmh: float, humidity: float = 50.0) -> float:
+# 体感模型中间区域（10°C < 温度 < TEMP_WARM）的温度跨度
+_MILD_TEMP_RANGE = TEMP_WARM - 10
+
+
+def _real_feel_array(temps: "np.ndarray", winds: "np.ndarray", hums: "np.ndarray") -> "np.ndarray":
     """
-    使用简化的气象学模型计算体感温度
+    使用简化的气象学模型逐元素计算体感温度（未取整）
+    
+    Args:
+        temps: 实际温度数组（摄氏度）
+        winds: 风速数组（km/h）
+        hums: 相对湿度数组（0-100%）
+    
+    Returns:
+        体感温度数组（摄氏度）
+    """
+    import numpy as np
+    
+    temps = np.asarray(temps, dtype=float)
+    winds = np.asarray(winds, dtype=float)
+    hums = np.asarray(hums, dtype=float)
+    
+    # 公共子表达式只计算一次（每次 NumPy 运算都会遍历整个数组并分配临时数组）
+    wind_root = np.sqrt(np.maximum(0, winds))
+    humidity_offset = hums - 50
+    
+    # 1. 低温区：考虑风寒效应 (主要针对 ≤ 10°C)
+    # 简化的风寒公式：温度 - 2 * sqrt(风速)，风速越大，体感温度下降越明显（非线性关系）
+    cold_feel = temps - 2 * wind_root
+    
+    # 2. 高温区：考虑湿度影响 (主要针对 ≥ TEMP_WARM°C)
+    # 湿度每增加 10%，体感约上升 1°C；以50%为基准，湿度越高体感越热
+    hot_feel = temps + humidity_offset * 0.1
+    
+    # 3. 中间区域：线性过渡（10°C < temperature < TEMP_WARM°C）
+    # 风寒效应随温度升高而减弱，湿度影响高温时增强、低温时减弱
+    wind_factor = (TEMP_WARM - temps) / _MILD_TEMP_RANGE * 1.5 * wind_root / 5
+    humidity_factor = (temps - 10) / _MILD_TEMP_RANGE * humidity_offset * 0.05
+    mild_feel = temps - wind_factor + humidity_factor
+    
+    real_feel = np.where(temps <= 10, cold_feel, np.where(temps >= TEMP_WARM, hot_feel, mild_feel))
+    
+    # 4. 湿冷修正（南方特供逻辑：低温高湿环境）
+    # 在低温高湿环境下（如南方冬雨），体感温度应显著低于实际温度；湿度越高、温度越低，影响越大
+    wet_cold = (temps < TEMP_MILD) & (hums > HUMIDITY_HIGH)
+    wet_cold_factor = (hums - 70) / 30 * (15 - temps) / 5 * 2
+    # real_feel 是 np.where 新建的数组，可原地只对湿冷元素做减法
+    return np.subtract(real_feel, wet_cold_factor, out=real_feel, where=wet_cold)
+
+
+@tool_logger("Calc_RealFeel_Batch", "批量计算体感温度（如逐小时或多日预报）")
+def Calc_RealFeel_Batch(temps: "np.ndarray", winds: "np.ndarray", hums: "np.ndarray") -> "np.ndarray":
+    """
+    向量化批量计算体感温度，计算模型与 Calc_RealFeel 一致
+    （取整使用 np.round，恰好落在 0.05 边界上的值可能与 Calc_RealFeel 相差 0.1）
+    
+    Args:
+        temps: 实际温度数组（摄氏度）
+        winds: 风速数组（km/h）
+        hums: 相对湿度数组（0-100%）
+    
+    Returns:
+        体感温度数组（摄氏度，保留一位小数）
+    """
+    import numpy as np
+    
+    return np.round(_real_feel_array(temps, winds, hums), 1)
+
+
+def _real_feel(temperature: float, wind_speed_kmh: float, humidity: float) -> float:
+    """
+    _real_feel_array 的单值版本（纯 Python，未取整）
+    
+    单值计算时 NumPy 的数组构造与调度开销远大于计算本身，因此单独保留；
+    两者的模型与运算顺序须保持一致。
     
     Args:
         temperature: 实际温度（摄氏度）
         wind_speed_kmh: 风速（km/h）
-        humidity: 相对湿度（0-100%），默认50%
+        humidity: 相对湿度（0-100%）
     
     Returns:
         体感温度（摄氏度）
     """
-    # 1. 低温区：考虑风寒效应 (主要针对 ≤ 10°C)
     if temperature <= 10:
-        # 简化的风寒公式：温度 - 2 * sqrt(风速)
-        # 风速越大，体感温度下降越明显（非线性关系）
-        wind_chill = 2 * math.sqrt(max(0, wind_speed_kmh))
-        real_feel = temperature - wind_chill
-    
-    # 2. 高温区：考虑湿度影响 (主要针对 ≥ TEMP_WARM°C)
+        # 1. 低温区：风寒效应
+        real_feel = temperature - 2 * math.sqrt(max(0, wind_speed_kmh))
     elif temperature >= TEMP_WARM:
-        # 湿度每增加 10%，体感约上升 1°C
-        # 以50%为基准，湿度越高体感越热
-        humidity_extra = (humidity - 50) * 0.1
-        real_feel = temperature + humidity_extra
-        
-    # 3. 中间区域：线性过渡（10°C < temperature < TEMP_WARM°C）
+        # 2. 高温区：湿度影响
+        real_feel = temperature + (humidity - 50) * 0.1
     else:
-        # 在中间区域，风寒和湿度影响都较小，但仍有轻微影响
-        # 风寒效应：随温度升高而减弱
-        temp_range = TEMP_WARM - 10
-        wind_factor = (TEMP_WARM - temperature) / temp_range * 1.5 * math.sqrt(max(0, wind_speed_kmh)) / 5
-        # 湿度影响：高温时增强，低温时减弱
-        humidity_factor = (temperature - 10) / temp_range * (humidity - 50) * 0.05
+        # 3. 中间区域：线性过渡
+        wind_root = math.sqrt(max(0, wind_speed_kmh))
+        wind_factor = (TEMP_WARM - temperature) / _MILD_TEMP_RANGE * 1.5 * wind_root / 5
+        humidity_factor = (temperature - 10) / _MILD_TEMP_RANGE * (humidity - 50) * 0.05
         real_feel = temperature - wind_factor + humidity_factor
-        
-    # 4. 湿冷修正（南方特供逻辑：低温高湿环境）
-    # 在低温高湿环境下（如南方冬雨），体感温度应显著低于实际温度
+    
+    # 4. 湿冷修正
     if temperature < TEMP_MILD and humidity > HUMIDITY_HIGH:
-        # 湿冷带来的额外体感下降
-        # 湿度越高、温度越低，影响越大
-        wet_cold_factor = (humidity - 70) / 30 * (15 - temperature) / 5 * 2
-        real_feel -= wet_cold_factor
-        
-    return round(real_feel, 1)
+        real_feel -= (humidity - 70) / 30 * (15 - temperature) / 5 * 2
+    
+    return real_feel
+
+
+@tool_logger("Calc_RealFeel", "科学计算体感温度（考虑风寒效应和湿度影响）")
+def Calc_RealFeel(temperature: float, wind_speed_kmh: float, humidity: float = 50.0) -> float:
+    """
+    使用简化的气象学模型计算体感温度
+    
+    Args:
+        temperature: 实际温度（摄氏度）
+        wind_speed_kmh: 风速（km/h）
+        humidity: 相对湿度（0-100%），默认50%
+    
+    Returns:
+        体感温度（摄氏度）
+    """
+    return round(_real_feel(temperature, wind_speed_kmh, humidity), 1)
 
 
 @tool_logger("Match_Clothing", "多维度场景化穿衣决策")
@@ -317,11 +961,8 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
         包含基础穿搭、配饰、鞋履、逻辑说明的字典
     """
     temp = weather_condition.get("temp_max", 20)  # 使用最高温做上限参考
-    temp_min = weather_condition.get("temp_min", 20)
-    temp_avg = (temp + temp_min) / 2
     humidity = weather_condition.get("humidity", 50)
     wind = weather_condition.get("wind", 0)  # 风力等级
-    wind_speed_kmh = weather_condition.get("wind_speed_kmh", 0)
     rain_chance = weather_condition.get("precipitation", 0)
     
     extra_items = []
@@ -329,17 +970,22 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
     logic_parts = []
     
     # 1. 核心分层建议（基于体感温度）
+    # base_tags 记录 base 中已包含的衣物属性：down（羽绒服）、jacket（夹克）、windproof（防风）
     if real_feel < TEMP_VERY_COLD:
         base = "保暖层（长袖内衣+毛衣）+ 加厚防风羽绒服"
+        base_tags = {"down", "windproof"}
         accessories = ["围巾", "手套"]
-    elif TEMP_VERY_COLD <= real_feel < TEMP_MILD:
+    elif real_feel < TEMP_MILD:
         base = "长袖衬衫/针织衫 + 防风夹克或呢大衣"
+        base_tags = {"jacket", "windproof"}
         accessories = []
-    elif TEMP_MILD <= real_feel < TEMP_WARM:
+    elif real_feel < TEMP_WARM:
         base = "短袖/薄长袖 + 轻便外套（如薄开衫）"
+        base_tags = set()
         accessories = []
     else:
         base = "吸湿排汗短袖 + 宽松短裤/短裙"
+        base_tags = set()
         accessories = []
     
     # 2. 深度环境决策 - 场景化处理
@@ -347,6 +993,7 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
     # --- 场景 A：湿热桑拿天 (如新加坡、夏季南方) ---
     if temp > TEMP_HOT and humidity > HUMIDITY_HIGH:
         base = "【清爽模式】极薄透气面料（亚麻/速干材质）"
+        base_tags = set()
         extra_items.append("极薄防晒衣（预防强冷气房温差）")
         footwear = "透气凉鞋或网面运动鞋"
         logic_parts.append(f"检测到湿热桑拿环境（温度{temp}°C，湿度{humidity}%），已为您优化为速干排汗方案，禁止厚重衣物")
@@ -354,45 +1001,41 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
     # --- 场景 B：湿冷魔法伤害 (如南方冬雨) ---
     elif temp < 12 and humidity > HUMIDITY_HIGH:
         # 湿冷场景：强调防风拨水
-        if base.find("羽绒服") == -1 and base.find("夹克") == -1:
+        if not base_tags & {"down", "jacket"}:
             base = "防风拨水外套 + " + base
+            base_tags.add("windproof")
         extra_items.append("暖宝宝或发热内衣（湿气会加速体温流失）")
         footwear = "防水靴或防拨水运动鞋"
         logic_parts.append(f"检测到湿冷环境（温度{temp}°C，湿度{humidity}%），已强化防风拨水方案，避免衣物受潮失去保暖性")
     
     # --- 场景 C：防风与降水（包含强风加固逻辑）---
-    wind_protection_added_to_base = False  # 标记是否已在base中添加防风属性
-    
-    def _handle_wind_protection(wind_level: int, temperature: float, is_strong_wind: bool = False):
-        """处理防风逻辑的辅助函数"""
-        nonlocal base, wind_protection_added_to_base
+    if wind >= WIND_STRONG:
+        is_strong_wind = wind >= WIND_VERY_STRONG
         
-        if temperature < TEMP_HOT:
+        if temp < TEMP_HOT:
             # 低温强风：需要防风保暖
-            if "防风" not in base:
+            wind_protection_added_to_base = False  # 标记是否已在base中添加防风属性
+            if "windproof" not in base_tags:
                 if is_strong_wind:
                     base = "强风加固型外套（冲锋衣/防风夹克） + " + base
+                    base_tags.add("jacket")
                 else:
                     base = "防风层（冲锋衣/风衣） + " + base
+                base_tags.add("windproof")
                 wind_protection_added_to_base = True
             
             if is_strong_wind:
                 extra_items.append("【强风加固型建议】避免易兜风衣物（如宽松长裙、大摆外套），选择贴身剪裁")
-                logic_parts.append(f"检测到{wind_level}级强风，已启用强风加固方案，避免易兜风衣物")
+                logic_parts.append(f"检测到{wind}级强风，已启用强风加固方案，避免易兜风衣物")
             elif not wind_protection_added_to_base:
                 # 去重：如果base中已有防风属性，不在extra中重复推荐
                 extra_items.append("防风层（冲锋衣/风衣）")
-                logic_parts.append(f"考虑{wind_level}级强风降温影响，已添加防风层")
+                logic_parts.append(f"考虑{wind}级强风降温影响，已添加防风层")
         else:
             # 高温强风：矛盾天气的综合权衡
             extra_items.append("【强风vs高温权衡】建议轻薄防风外套，避免完全暴露于强风中，同时保持透气性")
             extra_items.append("防风墨镜（预防风沙/强风）")
-            logic_parts.append(f"检测到高温强风矛盾天气（温度{temperature}°C，{wind_level}级风），已平衡防风与散热需求")
-    
-    if wind >= WIND_VERY_STRONG:
-        _handle_wind_protection(wind, temp, is_strong_wind=True)
-    elif wind >= WIND_STRONG:
-        _handle_wind_protection(wind, temp, is_strong_wind=False)
+            logic_parts.append(f"检测到高温强风矛盾天气（温度{temp}°C，{wind}级风），已平衡防风与散热需求")
     
     # 处理降水逻辑
     if rain_chance > RAIN_CHANCE_HIGH:
@@ -417,7 +1060,7 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
             footwear = "专业防滑雨鞋或备用袜子"
         elif rain_chance > RAIN_CHANCE_HIGH:
             footwear = "防滑运动鞋（建议防水处理）"
-        elif temp < 5:
+        elif temp < TEMP_COLD:
             footwear = "保暖防滑靴"
         elif temp > TEMP_VERY_HOT:
             footwear = "透气凉鞋或网面运动鞋"
@@ -430,9 +1073,21 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
         extra_items.append("【浓雾预警】湿度极高且无降水，可能存在浓雾，建议选择颜色鲜艳或反光材质的衣物，提高可见度")
         logic_parts.append(f"检测到极高湿度（{humidity}%）且无降水，已触发浓雾预警方案（多因素关联分析）")
     elif humidity > HUMIDITY_VERY_HIGH and rain_chance < RAIN_CHANCE_VERY_HIGH:
-        # 常规高湿度防潮提醒（但如果有降水，则优先考虑防雨）
-        if "防潮" not in " ".join(extra_items):
-            logic_parts.append(f"检测到极高湿度（{humidity}%），已切换至防潮排汗方案")
+        # 常规高湿度防潮提醒（但如果有降水，则优先考虑防雨）；extra_items 中没有防潮类条目，无需去重
+        logic_parts.append(f"检测到极高湿度（{humidity}%），已切换至防潮排汗方案")
+    
+    # --- 行李提醒：降水、保暖、防潮、防晒 ---
+    luggage_tips = []
+    if rain_chance >= RAIN_CHANCE_VERY_HIGH:
+        luggage_tips.append(f"降水概率{rain_chance}%，必须携带雨伞或雨衣")
+    elif rain_chance >= RAIN_CHANCE_MODERATE:
+        luggage_tips.append(f"降水概率{rain_chance}%，建议携带折叠伞备用")
+    if real_feel < TEMP_COLD:
+        luggage_tips.append(f"体感仅{real_feel}°C，建议携带围巾、手套等保暖配饰")
+    if humidity > HUMIDITY_VERY_HIGH and temp < TEMP_MILD:
+        luggage_tips.append("空气潮湿且气温偏低，注意防潮，选择不易吸湿的外套")
+    if temp >= TEMP_VERY_HOT:
+        luggage_tips.append("气温较高，记得携带防晒用品")
     
     # 4. 构建逻辑说明（包含矛盾天气的综合权衡说明）
     logic_desc = f"基于体感{real_feel}°C判断。"
@@ -445,9 +1100,9 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
     elif humidity > HUMIDITY_EXTREME and rain_chance < RAIN_CHANCE_MODERATE:
         logic_desc += " 【多因素关联】极高湿度且无降水，可能存在浓雾，已优化为浓雾预警方案。"
     
-    # 5. 汇总输出
-    accessories_str = "、".join(list(set(accessories))) if accessories else "无"
-    extra_items_str = "、".join(list(set(extra_items))) if extra_items else "无"
+    # 5. 汇总输出（dict.fromkeys 去重并保持顺序）
+    accessories_str = "、".join(dict.fromkeys(accessories)) if accessories else "无"
+    extra_items_str = "、".join(dict.fromkeys(extra_items)) if extra_items else "无"
     
     return {
         "clothing_base": base,  # 基础穿搭
@@ -462,6 +1117,51 @@ def Match_Clothing(real_feel: float, weather_condition: dict) -> dict:
         # 保持向后兼容的字段
         "clothing": base,
         "special_items": accessories_str if accessories_str != "无" else "无特殊装备",
-        "special_items_list": accessories
+        "special_items_list": accessories,
+        "luggage_tips": "；".join(luggage_tips) if luggage_tips else "无"  # 行李提醒
     }
 
+
+@tool_logger("Get_Outfit_Advice", "一次性获取天气、体感温度与穿衣建议")
+async def Get_Outfit_Advice(city: str, date: str) -> dict:
+    """
+    依次执行 Get_Weather → Calc_RealFeel → Match_Clothing，一次返回完整的穿衣建议所需数据
+    
+    异步工具：天气请求期间不阻塞智能体的事件循环。
+    调用链按依赖关系分为三层，新增不依赖体感温度的查询（如空气质量、紫外线）时，
+    应放在第二层与体感计算并发执行（asyncio.gather），使总耗时取决于最慢的一项而非各项之和。
+    
+    Args:
+        city: 城市名称（支持中英文，如：北京、Shanghai）
+        date: 日期（格式：YYYY-MM-DD，或相对日期如"今天"、"明天"、"后天"等）
+    
+    Returns:
+        只包含回复模板所需字段的字典（city、date、temp_max、temp_min、wind、humidity、real_feel、
+        official_real_feel_avg、clothing_base、extra_items、accessories、footwear、luggage_tips、logic），
+        避免重复的兼容字段占用模型上下文
+    """
+    # 第一层：天气数据（网络 I/O）
+    weather = await Get_Weather_Async(city, date)
+    
+    # 第二层：依赖天气数据的计算（目前只有体感温度，纯 CPU 计算，微秒级，直接执行）
+    real_feel = Calc_RealFeel(weather["temp_avg"], weather["wind_speed_kmh"], weather["humidity"])
+    
+    # 第三层：汇总决策
+    clothing = Match_Clothing(real_feel, weather)
+    
+    return {
+        "city": weather["city"],
+        "date": weather["date"],
+        "temp_max": weather["temp_max"],
+        "temp_min": weather["temp_min"],
+        "wind": weather["wind"],
+        "humidity": weather["humidity"],
+        "real_feel": real_feel,
+        "official_real_feel_avg": weather["official_real_feel_avg"],
+        "clothing_base": clothing["clothing_base"],
+        "extra_items": clothing["extra_items"],
+        "accessories": clothing["accessories"],
+        "footwear": clothing["footwear"],
+        "luggage_tips": clothing["luggage_tips"],
+        "logic": clothing["logic"],
+    }